@@ -0,0 +1,73 @@
+'''Compare parsing of results exported as CSV and as FBV
+
+Generates the same synthetic result in both formats and measures the
+read callbacks on it, without a database. Usage:
+
+    python tests/benchmark_fbv.py [rows]
+'''
+
+import datetime
+import io
+import sys
+import time
+from decimal import Decimal
+
+import exasol
+
+DESCRIPTION = [('ID', int, None, 18, 18, 0, True),
+               ('PRICE', Decimal, None, 12, 12, 2, True),
+               ('X', float, None, 15, 15, 0, True),
+               ('OK', bool, None, 1, 1, 0, True),
+               ('D', datetime.date, None, 10, 10, 0, True),
+               ('T', datetime.datetime, None, 29, 29, 0, True),
+               ('NAME', str, None, 10, 10, 0, True)]
+
+
+def rows(count):
+    for i in range(count):
+        yield [u'%d' % i,
+               u'%s%d.%02d' % ('-' if i % 3 == 0 else '', i % 10000, i % 100) if i % 11 else u'',
+               u'%r' % (i * 0.25),
+               u'1' if i % 2 else u'0',
+               u'2020-01-%02d' % (i % 28 + 1),
+               u'2021-02-03 04:05:06.%06d' % (i % 999999),
+               u'name%d' % (i % 50) if i % 7 else u'']
+
+
+def fbvData(columns, count):
+    lines = []
+    for row in rows(count):
+        fields = []
+        for (name, kind, size, scale), value in zip(columns, row):
+            value = value.encode('utf-8')
+            fields.append(value.rjust(size) if kind in ('int', 'decimal', 'float') else value.ljust(size))
+        lines.append(b''.join(fields) + b'\n')
+    return b''.join(lines)
+
+
+def csvData(count):
+    return u','.join(column[0] for column in DESCRIPTION) + u'\n' + \
+        u''.join(u','.join(row) + u'\n' for row in rows(count))
+
+
+def best(function, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        function()
+        times.append(time.time() - start)
+    return min(times)
+
+
+def main(count):
+    columns = exasol.fbvColumns(DESCRIPTION)
+    fbv, text = fbvData(columns, count), csvData(count)
+    print('%d rows, CSV %d bytes, FBV %d bytes' % (count, len(text.encode('utf-8')), len(fbv)))
+    for name, function in [('pandasReadCallback (CSV)', lambda: exasol.pandasReadCallback(io.StringIO(text))),
+                           ('csvReadCallback (CSV)', lambda: exasol.csvReadCallback(io.StringIO(text))),
+                           ('fbvReadCallback (FBV)', lambda: exasol.fbvReadCallback(io.BytesIO(fbv), columns))]:
+        print('%-26s %.2f s' % (name, best(function)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -3,11 +3,15 @@
 import sys
 import operator
 import os
+import shutil
 import socket
+import tempfile
+import multiprocessing
 import unittest
 import random
 from decimal import Decimal
 
+import numpy
 import pyodbc
 import pandas
 
@@ -75,6 +79,13 @@ class ODBCOnlyTest(TestCase):
         with exasol.connect(**self.odbc_kwargs) as con:
             self.assertEqual((host, port), con.serverAddress)
 
+    def test_serverAddress_cluster(self):
+        self.assertEqual([('10.0.0.11', 8563), ('10.0.0.12', 8563), ('n2', 8563)],
+                         exasol.parseHosts('10.0.0.11..12,n2:8563'))
+        with exasol.connect(serverAddress=self.odbc_kwargs['EXAHOST'], **self.odbc_kwargs) as con:
+            rows = con.readCSV('SELECT * FROM dual')
+        self.assertEqual(1, len(rows))
+
 
 class CSVTest(TestCase):
     def test_readCSV_gets_all_rows(self):
@@ -97,6 +108,15 @@ class CSVTest(TestCase):
         self.assertEqual(sum_,
                          reduce(operator.add, [Decimal(row[0]) for row in rows if len(row)]))
 
+    def test_readColumnar_gets_same_data(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            crs = ecn.cursor()
+            crs.execute('SELECT sum(decimal1) FROM exasol_travis_python.data_exchange_table')
+            sum_ = crs.fetchone()[0]
+            rows = ecn.readColumnar('SELECT decimal1 FROM exasol_travis_python.data_exchange_table')
+        self.assertEqual(50, len(rows))
+        self.assertEqual(sum_, sum(value for value in rows.column('DECIMAL1') if value is not None))
+
     def test_writeCSV_works(self):
         with exasol.connect(**self.odbc_kwargs) as ecn:
             c = ecn.cursor()
@@ -115,6 +135,271 @@ class CSVTest(TestCase):
             self.assertEqual(expected, result)
 
 
+class IterTest(TestCase):
+    def test_iterData_gets_all_rows(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            rows = list(ecn.iterData('SELECT decimal1 FROM exasol_travis_python.data_exchange_table',
+                                     batchSize=7))
+            self.assertEqual(50, len(rows))
+
+    def test_iterData_stop_early(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            for row in ecn.iterData('SELECT decimal1 FROM exasol_travis_python.data_exchange_table',
+                                    batchSize=1):
+                break
+            rows = ecn.readCSV('SELECT * FROM dual')
+            self.assertEqual(1, len(rows))
+
+
+class FastCursorTest(TestCase):
+    def test_fast_cursor_returns_same_rows(self):
+        sqlCommand = 'SELECT decimal1 FROM exasol_travis_python.data_exchange_table ORDER BY 1'
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            rows = [tuple(row) for row in ecn.cursor().execute(sqlCommand).fetchall()]
+            crs = ecn.cursor(fast=True)
+            self.assertEqual(rows[:1], crs.execute(sqlCommand).fetchmany(1))
+            self.assertEqual(rows[1:], crs.fetchall())
+            self.assertEqual(1, len(crs.execute('SELECT * FROM dual WHERE 1 = ?', 1).fetchall()))
+
+    def test_connection_is_usable_after_partial_fetch(self):
+        sqlCommand = 'SELECT decimal1 FROM exasol_travis_python.data_exchange_table ORDER BY 1'
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            rows = [tuple(row) for row in ecn.cursor().execute(sqlCommand).fetchall()]
+            crs = ecn.cursor(fast=True)
+            self.assertEqual(rows[:1], [crs.execute(sqlCommand).fetchone()])
+            self.assertIs(crs, ecn._fastCursor)  # the rest is streamed through the tunnel
+            self.assertEqual(1, ecn.execute('SELECT 1 FROM dual').fetchone()[0])
+            self.assertEqual(rows[1:], crs.fetchall())
+
+    def test_null_in_single_column(self):
+        sqlCommand = 'SELECT CAST(NULL AS DECIMAL(18, 0)) FROM exasol_travis_python.data_exchange_table'
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            rows = [tuple(row) for row in ecn.cursor().execute(sqlCommand).fetchall()]
+            self.assertEqual(rows, ecn.cursor(fast=True).execute(sqlCommand).fetchall())
+            self.assertIn((None,), rows)
+
+
+class ReadManyTest(TestCase):
+    def test_readMany_returns_results_in_order(self):
+        with exasol.connect(useCSV=True, **self.odbc_kwargs) as ecn:
+            rows = ecn.readMany(['SELECT %d FROM dual' % i for i in range(10)], parallel=3)
+        self.assertEqual([[[str(i)]] for i in range(10)], rows)
+
+    def test_readMany_unordered(self):
+        with exasol.connect(useCSV=True, **self.odbc_kwargs) as ecn:
+            rows = dict(ecn.readMany(['SELECT %d FROM dual' % i for i in range(10)], ordered=False))
+        self.assertEqual(dict((i, [[str(i)]]) for i in range(10)), rows)
+
+    def test_readMany_uses_current_schema(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            ecn.execute('OPEN SCHEMA exasol_travis_python')
+            results = ecn.readMany(['SELECT decimal1 FROM data_exchange_table'] * 3,
+                                   readCallback=exasol.csvReadCallback)
+        self.assertEqual([50, 50, 50], [len(rows) for rows in results])
+
+
+class TransferTest(TestCase):
+    def test_progressCallback_gets_all_rows(self):
+        progress = []
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            ecn.readCSV('SELECT decimal1 FROM exasol_travis_python.data_exchange_table',
+                        progressCallback=lambda transfer: progress.append(transfer.rows))
+        self.assertEqual(51, progress[-1])
+
+    def test_timeout_cancels_transfer(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            with self.assertRaises(exasol.TransferCancelled):
+                ecn.readCSV('SELECT a.decimal1 FROM exasol_travis_python.data_exchange_table a, '
+                            'exasol_travis_python.data_exchange_table b, '
+                            'exasol_travis_python.data_exchange_table c, '
+                            'exasol_travis_python.data_exchange_table d', timeout=0.5)
+            rows = ecn.readCSV('SELECT * FROM dual')
+            self.assertEqual(1, len(rows))
+
+
+class CopyDataTest(TestCase):
+    def test_copyData_between_connections(self):
+        with exasol.connect(**self.odbc_kwargs) as src:
+            with exasol.connect(**self.odbc_kwargs) as dst:
+                c = dst.cursor()
+                c.execute('OPEN SCHEMA exasol_travis_python')
+                c.execute('DROP TABLE IF EXISTS T')
+                c.execute('CREATE TABLE T (decimal1 DECIMAL)')
+                c.commit()
+                exasol.copyData(src, 'SELECT decimal1 FROM exasol_travis_python.data_exchange_table',
+                                dst, 'exasol_travis_python.T')
+                rows = c.execute('SELECT * FROM exasol_travis_python.T').fetchall()
+                c.execute('DROP TABLE exasol_travis_python.T')
+        self.assertEqual(50, len(rows))
+
+    def test_copyData_keeps_multibyte_characters(self):
+        # the bytes are copied unchanged, also where a HTTP chunk splits a character
+        text = u'\xe4\xf6\xfc\u20ac' * 1000
+        with exasol.connect(**self.odbc_kwargs) as src:
+            with exasol.connect(**self.odbc_kwargs) as dst:
+                c = dst.cursor()
+                c.execute('OPEN SCHEMA exasol_travis_python')
+                c.execute('DROP TABLE IF EXISTS T')
+                c.execute('CREATE TABLE T (s VARCHAR(4000))')
+                c.commit()
+                exasol.copyData(src, "SELECT REPEAT('%s', 1000) FROM exasol_travis_python.data_exchange_table" %
+                                text[:4], dst, 'exasol_travis_python.T')
+                rows = c.execute('SELECT * FROM exasol_travis_python.T').fetchall()
+                c.execute('DROP TABLE exasol_travis_python.T')
+        self.assertEqual([text] * 50, [row[0] for row in rows])
+
+    def test_copyData_same_connection(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            with self.assertRaises(ValueError):
+                exasol.copyData(ecn, 'SELECT * FROM dual', ecn, 'T')
+
+
+class TempDirTestCase(TestCase):
+    def setUp(self):
+        super(TempDirTestCase, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        super(TempDirTestCase, self).tearDown()
+
+
+class FileTest(TempDirTestCase):
+    def roundtrip(self, *names):
+        paths = [os.path.join(self.tmpdir, name) for name in names]
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            c = ecn.cursor()
+            c.execute('OPEN SCHEMA exasol_travis_python')
+            c.execute('DROP TABLE IF EXISTS T')
+            c.execute('CREATE TABLE T (decimal1 DECIMAL)')
+            ecn.exportToFile('SELECT decimal1 FROM data_exchange_table', paths)
+            ecn.importFromFile(paths, 'T', skip=1)
+            rows = c.execute('SELECT * FROM T').fetchall()
+            c.execute('DROP TABLE T')
+        self.assertEqual(50, len(rows))
+
+    def test_export_import_file(self):
+        self.roundtrip('data.csv')
+
+    def test_export_import_compressed_file(self):
+        self.roundtrip('data.csv.gz')
+
+    def test_export_import_multiple_files(self):
+        self.roundtrip('data1.csv', 'data2.csv.gz', 'data3.csv.bz2')
+
+
+class IncrementalTest(TempDirTestCase):
+    def test_readIncremental_reads_only_new_rows(self):
+        state = os.path.join(self.tmpdir, 'state.json')
+        with exasol.connect(useCSV=True, **self.odbc_kwargs) as ecn:
+            c = ecn.cursor()
+            c.execute('OPEN SCHEMA exasol_travis_python')
+            c.execute('DROP TABLE IF EXISTS T')
+            c.execute('CREATE TABLE T (id INT)')
+            c.execute('INSERT INTO T VALUES 1, 2, 3')
+            self.assertEqual(3, len(ecn.readIncremental('T', 'id', state)))
+            c.execute('INSERT INTO T VALUES 4, 5')
+            self.assertEqual([['4'], ['5']], sorted(ecn.readIncremental('T', 'id', state)))
+            self.assertEqual([], ecn.readIncremental('T', 'id', state))
+            c.execute('DROP TABLE T')
+
+
+class RejectTest(TempDirTestCase):
+    rows = [[1], [2], ['x'], [3], ['y']]
+
+    def setUp(self):
+        super(RejectTest, self).setUp()
+        self.ecn = exasol.connect(useCSV=True, **self.odbc_kwargs)
+        self.c = self.ecn.cursor()
+        self.c.execute('OPEN SCHEMA exasol_travis_python')
+        self.c.execute('DROP TABLE IF EXISTS T')
+        self.c.execute('DROP TABLE IF EXISTS T_ERRORS')
+        self.c.execute('CREATE TABLE T (id INT)')
+
+    def tearDown(self):
+        self.c.execute('DROP TABLE IF EXISTS T')
+        self.c.execute('DROP TABLE IF EXISTS T_ERRORS')
+        self.ecn.close()
+        super(RejectTest, self).tearDown()
+
+    def test_import_fails_on_bad_rows(self):
+        with self.assertRaises(pyodbc.Error):
+            self.ecn.writeData(self.rows, 'T')
+
+    def test_rejectLimit(self):
+        result = self.ecn.writeData(self.rows, 'T', rejectLimit=2)
+        self.assertEqual((3, None), (result.loaded, result.rejected))
+        with self.assertRaises(pyodbc.Error):
+            self.ecn.writeData(self.rows, 'T', rejectLimit=1)
+
+    def test_errorTable(self):
+        result = self.ecn.writeData(self.rows, 'T', errorTable='T_ERRORS')
+        self.assertEqual((3, 2), (result.loaded, result.rejected))
+        self.assertEqual(2, self.c.execute('SELECT COUNT(*) FROM T_ERRORS').fetchone()[0])
+
+    def test_errorFile(self):
+        errorFile = os.path.join(self.tmpdir, 'errors.csv')
+        result = self.ecn.writeData(self.rows, 'T', errorFile=errorFile)
+        self.assertEqual((3, 2), (result.loaded, result.rejected))
+        with open(errorFile) as f:
+            self.assertIn('x', f.read())
+
+
+class ResumableTest(TempDirTestCase):
+    def test_readResumable_writeResumable(self):
+        path = os.path.join(self.tmpdir, 'export')
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            c = ecn.cursor()
+            c.execute('OPEN SCHEMA exasol_travis_python')
+            c.execute('DROP TABLE IF EXISTS T')
+            c.execute('CREATE TABLE T (decimal1 DECIMAL)')
+            c.commit()
+            files = ecn.readResumable('data_exchange_table', 'decimal1', path, chunks=4)
+            self.assertEqual(files, ecn.readResumable('data_exchange_table', 'decimal1', path, chunks=4))
+            ecn.writeResumable(files, 'T', skip=1)
+            rows = c.execute('SELECT * FROM T').fetchall()
+            c.execute('DROP TABLE T')
+            c.commit()
+        self.assertEqual(50, len(rows))
+
+
+class ParquetTest(TestCase):
+    def setUp(self):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            self.skipTest('pyarrow is not installed')
+        super(ParquetTest, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+        super(ParquetTest, self).tearDown()
+
+    def test_readParquet_writeParquet(self):
+        import pyarrow.parquet
+        path = os.path.join(self.tmpdir, 'data.parquet')
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            c = ecn.cursor()
+            c.execute('OPEN SCHEMA exasol_travis_python')
+            c.execute('DROP TABLE IF EXISTS T')
+            c.execute('CREATE TABLE T (decimal1 DECIMAL)')
+            self.assertEqual(50, ecn.readParquet('SELECT decimal1 FROM data_exchange_table', path))
+            self.assertEqual(50, pyarrow.parquet.ParquetFile(path).metadata.num_rows)
+            ecn.writeParquet(path, 'T')
+            rows = c.execute('SELECT * FROM T').fetchall()
+            c.execute('DROP TABLE T')
+        self.assertEqual(50, len(rows))
+
+
+def sumSharedFrame(shared):
+    frame = shared.attach()
+    try:
+        return float(frame['DECIMAL1'].sum())
+    finally:
+        shared.release()
+
+
 class PandasTest(TestCase):
     def test_readPandas_gets_all_rows(self):
         with exasol.connect(**self.odbc_kwargs) as ecn:
@@ -134,6 +419,39 @@ class PandasTest(TestCase):
             rows = ecn.readPandas('SELECT decimal1 FROM exasol_travis_python.data_exchange_table')
         self.assertAlmostEqual(float(sum_), float(rows.sum()))
 
+    def test_parallelPandasReadCallback_gets_same_data(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            sqlCommand = 'SELECT decimal1 FROM exasol_travis_python.data_exchange_table ORDER BY 1'
+            rows = ecn.readPandas(sqlCommand)
+            parallelRows = ecn.readData(sqlCommand, readCallback=exasol.parallelPandasReadCallback,
+                                        blockSize=64, workers=3)
+        self.assertTrue(rows.equals(parallelRows))
+
+    def test_readFBV_gets_same_data(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            sqlCommand = 'SELECT decimal1 FROM exasol_travis_python.data_exchange_table ORDER BY 1'
+            rows = ecn.readPandas(sqlCommand)
+            fbvRows = ecn.readFBV(sqlCommand)
+        self.assertEqual(list(rows.columns), list(fbvRows.columns))
+        self.assertTrue(numpy.allclose(rows['DECIMAL1'], fbvRows['DECIMAL1'], equal_nan=True))
+
+    def test_readShared_attach_in_workers(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            sqlCommand = 'SELECT decimal1 FROM exasol_travis_python.data_exchange_table'
+            rows = ecn.readPandas(sqlCommand)
+            shared = ecn.readShared(sqlCommand)
+        pool = multiprocessing.Pool(2)
+        try:
+            sums = pool.map(sumSharedFrame, [shared] * 4)
+        finally:
+            pool.terminate()
+        with shared as frame:
+            self.assertTrue(rows.equals(frame))
+        shared.release()
+        self.assertEqual([float(rows['DECIMAL1'].sum())] * 4, sums)
+        with self.assertRaises(Exception):
+            shared.attach()
+
     def test_writePandas_works(self):
         with exasol.connect(**self.odbc_kwargs) as ecn:
             c = ecn.cursor()
@@ -154,6 +472,43 @@ class PandasTest(TestCase):
             c.execute('DROP TABLE exasol_travis_python.t')
             self.assertEqual(expected, result)
 
+    def test_categories_auto(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            data = ecn.readPandas("SELECT decimal1, CASE WHEN decimal1 > 0.5 THEN 'high' ELSE 'low' END AS level "
+                                  "FROM exasol_travis_python.data_exchange_table", categories='auto')
+        self.assertEqual('category', str(data['LEVEL'].dtype))
+        self.assertEqual(50, len(data))
+
+    def test_fixedDecimals_roundtrip_exactly(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            c = ecn.cursor()
+            c.execute('OPEN SCHEMA exasol_travis_python')
+            c.execute('DROP TABLE IF EXISTS T')
+            c.execute('CREATE TABLE T (x DECIMAL(18,4))')
+            c.execute("INSERT INTO T VALUES 12345678901234.5678, -0.0001, NULL")
+            data = ecn.readPandas('SELECT x FROM T', fixedDecimals=True)
+            self.assertEqual({'X': 4}, data.attrs['fixedDecimals'])
+            self.assertEqual([-1, 123456789012345678], sorted(data['X'].dropna().tolist()))
+            c.execute('DELETE FROM T')
+            ecn.writePandas(data, 'T')
+            rows = c.execute('SELECT x FROM T WHERE x IS NOT NULL ORDER BY 1').fetchall()
+            c.execute('DROP TABLE T')
+        self.assertEqual([Decimal('-0.0001'), Decimal('12345678901234.5678')], [row[0] for row in rows])
+
+    def test_parallelPandasWriteCallback_keeps_order(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            c = ecn.cursor()
+            c.execute('OPEN SCHEMA exasol_travis_python')
+            c.execute('DROP TABLE IF EXISTS T')
+            # the identity column numbers the rows in the order in which they are imported
+            c.execute('CREATE TABLE T (seq INT IDENTITY, x INT, y VARCHAR(10))')
+            data = pandas.DataFrame({1: range(100), 2: ["a"] * 100})
+            ecn.writeData(data, 'T', columnNames=['x', 'y'], writeCallback=exasol.parallelPandasWriteCallback,
+                          shardSize=7, workers=3)
+            rows = c.execute('SELECT x FROM T ORDER BY seq').fetchall()
+            c.execute('DROP TABLE T')
+        self.assertEqual(list(range(100)), [int(row[0]) for row in rows])
+
 
 class DefaultsTest(TestCase):
     def test_readData_defaults_to_pandas(self):
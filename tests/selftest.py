@@ -1,7 +1,27 @@
 '''Test the frame work functionality'''
 
+import io
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
 import unittest
 
+# seconds, which importing the package in a fresh interpreter may take at most
+IMPORT_TIME_BUDGET = 0.05
+
+
+def run_python(code):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # measure without compiling
+    env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(os.path.dirname(os.path.abspath(__file__)))] +
+                                        [p for p in [env.get('PYTHONPATH')] if p])
+    return subprocess.check_output([sys.executable, '-c', code], env=env).decode('utf-8')
+
+
 class SelfTest(unittest.TestCase):
     def test_import(self):
         try:
@@ -9,6 +29,106 @@ class SelfTest(unittest.TestCase):
         except Exception as e:
             self.fail(str(e))
 
+    def test_connect_is_documented(self):
+        import exasol
+        self.assertIn('PyODBC compatible', exasol.connect.__doc__)
+
+    def test_import_loads_no_heavy_modules(self):
+        modules = run_python('import sys, exasol; print(" ".join(sys.modules))').split()
+        for name in ('pyodbc', 'multiprocessing', 'pandas', 'numpy', 'pyarrow', 'asyncore', 'asynchat',
+                     'socketserver', 'SocketServer', 'http.server', 'BaseHTTPServer', 'http.client', 'httplib',
+                     'ssl', 'pickle', 'csv', 'json', 'decimal', 'tempfile', 'hashlib'):
+            self.assertNotIn(name, modules)
+
+    def test_import_time(self):
+        # cold import in a fresh interpreter, including the standard modules
+        code = 'import time; t = time.time(); import exasol; print(time.time() - t)'
+        run_python(code)  # write the byte code
+        seconds = min(float(run_python(code)) for _ in range(5))
+        self.assertLess(seconds, IMPORT_TIME_BUDGET)
+
+
+class ColumnarTest(unittest.TestCase):
+    text = u'I,F,D,S,M\n1,1.5,0.25,a,1\n,,,,x\n-3,2E3,-1.5,b,3\n'
+
+    def test_columnarReadCallback(self):
+        import exasol
+        from decimal import Decimal
+        result = exasol.columnarReadCallback(io.StringIO(self.text), columnTypes={'D': 2})
+        self.assertEqual(['I', 'F', 'D', 'S', 'M'], result.columns)
+        self.assertEqual(['int', 'float', 'decimal', 'dict', 'dict'],
+                         [result.column(name).kind for name in result.columns])
+        self.assertEqual([[1, 1.5, Decimal('0.25'), 'a', '1'],
+                          [None, None, None, None, 'x'],
+                          [-3, 2000.0, Decimal('-1.50'), 'b', '3']], list(result))
+        self.assertEqual([1, 0, -3], list(result.column('I').data))
+
+    def test_null_in_single_column(self):
+        import exasol
+        # the NULL is exported as empty line
+        for columnTypes in (None, {'A': 'int'}):
+            result = exasol.columnarReadCallback(io.StringIO(u'A\n1\n\n3\n'), columnTypes=columnTypes)
+            self.assertEqual([[1], [None], [3]], list(result))
+        result = exasol.columnarReadCallback(io.StringIO(u'A\n1\n\n3\n'), sampleRows=1)
+        self.assertEqual([[1], [None], [3]], list(result))
+
+    def test_dictionary_changes_to_offsets(self):
+        import exasol
+        column = exasol.ColumnarColumn('S', 'str')
+        column.dictionaryLimit = 2
+        for value in ['a', '', 'b', 'c', 'a']:
+            column.append(value)
+        self.assertEqual('str', column.kind)
+        self.assertEqual(['a', None, 'b', 'c', 'a'], list(column))
+
+
+@unittest.skipUnless(hasattr(socket, 'SO_REUSEPORT'), 'SO_REUSEPORT is not supported')
+class OutputServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        probe = socket.socket()
+        probe.bind(('127.0.0.1', 0))
+        self.port = probe.getsockname()[1]
+        probe.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def start(self, *args):
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        service = subprocess.Popen([sys.executable, '-c', 'import exasol; exasol.outputService()',
+                                    '-s', '127.0.0.1', '-p', str(self.port)] + list(args),
+                                   stdout=subprocess.PIPE, env=env)
+        self.assertIn('bind', service.stdout.readline().decode('utf-8'))
+        time.sleep(0.5)
+        return service
+
+    def send(self, lines):
+        for line in lines:
+            client = socket.create_connection(('127.0.0.1', self.port))
+            client.sendall((line + '\n').encode('utf-8'))
+            client.close()
+        time.sleep(1)
+
+    def test_workers_filter_to_stdout(self):
+        service = self.start('--workers', '3', '--filter', 'keep')
+        self.send(['keep %d' % i for i in range(10)] + ['drop %d' % i for i in range(10)])
+        service.terminate()
+        output = service.communicate()[0].decode('utf-8')
+        self.assertEqual(sorted(line.split('> ', 1)[1] for line in output.splitlines()),
+                         sorted('keep %d' % i for i in range(10)))
+
+    def test_workers_sample_to_files(self):
+        service = self.start('--workers', '2', '--output-dir', self.tempdir, '--sample', '0.5')
+        self.send(['line %d' % i for i in range(200)])
+        service.terminate()
+        service.communicate()
+        lines = 0
+        for name in os.listdir(self.tempdir):
+            with open(os.path.join(self.tempdir, name)) as f:
+                lines += len(f.readlines())
+        self.assertTrue(50 < lines < 150)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
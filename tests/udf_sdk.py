@@ -187,6 +187,183 @@ class SimpleFunctionality(TestCase):
                  "SELECT * FROM EXA_ALL_SCRIPTS WHERE script_name = 'FOOBAR'").fetchall()))
 
 
+class ContentHash(TestCase):
+    def create_script(self, ecn, replaceScript=True):
+        @ecn.createScript(name='foo.hashed', replaceScript=replaceScript,
+                          inArgs=[('a', INT)], outArgs=[('a', INT)])
+        def foo(ctx):
+            ctx.emit(ctx.a)
+
+    def test_script_text_contains_hash(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            self.create_script(ecn)
+            rows = ecn.cursor().execute(dedent("""\
+                    SELECT script_text
+                    FROM EXA_ALL_SCRIPTS
+                    WHERE script_name = 'HASHED' and
+                        script_schema = 'FOO'
+                    """)).fetchall()
+        self.assertIn(exasol.SCRIPT_HASH_MARKER, rows[0][0])
+
+    def test_unchanged_script_is_not_created_again(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            self.create_script(ecn)
+            # would fail with "already exists" if executed again
+            self.create_script(ecn, replaceScript=False)
+
+
+class DeferredScripts(TestCase):
+    def count_scripts(self, name):
+        with pyodbc.connect(**self.odbc_kwargs) as con:
+            return len(con.cursor().execute(dedent("""\
+                    SELECT *
+                    FROM EXA_ALL_SCRIPTS
+                    WHERE script_name = '%s' and
+                        script_schema = 'FOO'
+                    """ % name)).fetchall())
+
+    def test_deferred_script_is_created_on_deploy(self):
+        with exasol.connect(scriptSchema='foo', deferScripts=True, **self.odbc_kwargs) as ecn:
+            @ecn.createScript(inArgs=[('a', INT)], outArgs=[('a', INT)])
+            def deferred1(ctx):
+                ctx.emit(ctx.a)
+
+            @ecn.createScript(inArgs=[('a', INT)], outArgs=[('a', INT)])
+            def deferred2(ctx):
+                ctx.emit(ctx.a)
+
+            self.assertEqual(0, self.count_scripts('DEFERRED1'))
+            ecn.deployScripts()
+            ecn.commit()
+        self.assertEqual(1, self.count_scripts('DEFERRED1'))
+        self.assertEqual(1, self.count_scripts('DEFERRED2'))
+
+    def test_deferred_script_is_created_on_first_call(self):
+        with exasol.connect(useCSV=True, **self.odbc_kwargs) as ecn:
+            ecn.execute('OPEN SCHEMA foo')
+
+            @ecn.createScript(inArgs=[('a', INT)], outArgs=[('a', INT)], deferred=True)
+            def foo(ctx):
+                ctx.emit(ctx.a)
+
+            self.assertEqual([['3']], foo(3, table='dual'))
+
+
+class Broadcast(TestCase):
+    @unittest.skipUnless('BUCKETFS' in os.environ, 'requires a BucketFS bucket')
+    def test_broadcast_variable_is_available(self):
+        with exasol.connect(useCSV=True,
+                            bucketFS=os.environ['BUCKETFS'],
+                            **self.odbc_kwargs) as ecn:
+            ecn.execute('OPEN SCHEMA foo')
+
+            @ecn.createScript(inType=SCALAR,
+                              inArgs=[('a', INT)],
+                              outType=RETURNS,
+                              outArgs=INT,
+                              broadcast={'lookup': dict((i, i * 2) for i in range(100000))})
+            def foo(ctx):
+                return broadcast['lookup'][int(ctx.a)]
+
+            self.assertEqual([['84']], foo(42, table='dual'))
+
+
+class LazyRelation(TestCase):
+    def test_compose_scripts_in_one_query(self):
+        with exasol.connect(useCSV=True, scriptSchema='foo', **self.odbc_kwargs) as ecn:
+            @ecn.createScript(inType=SCALAR, inArgs=[('a', INT)],
+                              outArgs=[('b', INT)])
+            def double(ctx):
+                ctx.emit(ctx.a * 2)
+
+            @ecn.createScript(inType=SCALAR, inArgs=[('b', INT)],
+                              outType=RETURNS, outArgs=INT)
+            def increment(ctx):
+                return ctx.b + 1
+
+            rel = ecn.relation('SELECT 21 AS a FROM dual')
+            rel = rel.apply(double, 'a').filter('b > 0')
+            rel = increment('b', table=rel, lazy=True)
+            self.assertIsInstance(rel, exasol.Relation)
+            self.assertEqual([['43']], rel.collect())
+            self.assertEqual([['43']], list(rel.iter()))
+
+
+class MapReduce(TestCase):
+    def test_word_count(self):
+        with exasol.connect(useCSV=True, scriptSchema='foo', **self.odbc_kwargs) as ecn:
+            def mapper(ctx):
+                for word in ctx.line.split():
+                    ctx.emit(word, 1)
+
+            def reducer(ctx):
+                word, count = ctx.word, 0
+                while True:
+                    count += ctx.cnt
+                    if not ctx.next():
+                        break
+                ctx.emit(word, count)
+
+            lines = ecn.relation("SELECT 'a b a' AS line FROM dual UNION ALL SELECT 'b a' FROM dual")
+            result = ecn.mapReduce(mapper, reducer, table=lines, key='word',
+                                   inArgs=[('line', VARCHAR(100))],
+                                   mapOutArgs=[('word', VARCHAR(100)), ('cnt', INT)],
+                                   outArgs=[('word', VARCHAR(100)), ('cnt', INT)])
+        self.assertEqual([['a', '3'], ['b', '2']], sorted(result))
+
+    def test_jobs_with_string_arguments_do_not_replace_each_other(self):
+        with exasol.connect(useCSV=True, scriptSchema='foo', **self.odbc_kwargs) as ecn:
+            def mapper(ctx):
+                ctx.emit(ctx.line, 1)
+
+            def reducer(ctx):
+                ctx.emit(ctx.word, ctx.cnt)
+
+            lines = ecn.relation("SELECT 'a' AS line FROM dual")
+            first = ecn.mapReduce(mapper, reducer, table=lines, key='word', name='first_job',
+                                  inArgs='line VARCHAR(100)', mapOutArgs='word VARCHAR(100), cnt INT',
+                                  outArgs='word VARCHAR(100), cnt INT', lazy=True)
+            second = ecn.mapReduce(mapper, reducer, table=lines, key='word', name='second_job',
+                                   inArgs='line VARCHAR(100)', mapOutArgs='word VARCHAR(100), cnt INT',
+                                   outArgs='word VARCHAR(100), total INT', lazy=True)
+            self.assertEqual([['a', '1']], first.collect())
+            self.assertEqual([['a', '1']], second.collect())
+            self.assertEqual(['WORD', 'TOTAL'], [c[0] for c in ecn._describe(second.sqlCommand)])
+
+
+class Profiling(TestCase):
+    @unittest.skipIf(os.environ.get('TRAVIS_OS_NAME') is not None,
+                     'fails on Travis CI, skipping')
+    def test_profile_report(self):
+        buffer = StringIO()
+        with exasol.connect(clientAddress=(None, 0),
+                            outputFile=buffer,
+                            scriptSchema='foo',
+                            useCSV=True,
+                            **self.odbc_kwargs) as ecn:
+
+            @ecn.createScript(inArgs=[('a', INT)], outArgs=[('b', INT)], profile='cprofile')
+            def double(ctx):
+                while True:
+                    ctx.emit(2 * ctx.a)
+                    if not ctx.next():
+                        break
+
+            out = double('a', table=ecn.relation('SELECT 1 AS a FROM dual UNION ALL SELECT 2 FROM dual'))
+            report = ecn.profileReport()
+
+        self.assertEqual(2, len(out))
+        self.assertEqual(2, sum(instance['rowsIn'] for instance in report.instances))
+        self.assertEqual(2, sum(instance['rowsOut'] for instance in report.instances))
+        self.assertTrue(report.functions)
+        self.assertNotIn('EXAPROFILE', buffer.getvalue())
+
+    def test_profile_requires_output_service(self):
+        with exasol.connect(**self.odbc_kwargs) as ecn:
+            with self.assertRaises(RuntimeError):
+                ecn.createScript(inArgs=[('a', INT)], outArgs=[('b', INT)], profile=True)
+
+
 class DataTypes(TestCase):
     def create_script(self, type_):
         with exasol.connect(**self.odbc_kwargs) as ecn: